@@ -1,5 +1,6 @@
 from file_reader import scan_configs
 import difflib
+import os
 
 def compare_folders(old_root, new_root):
     old_components = scan_configs(old_root)
@@ -15,14 +16,14 @@ def compare_folders(old_root, new_root):
 
         detailed[comp] = []
 
-        for old_file in old_components[comp]:
-            file_name = old_file.split("\\")[-1]
-            match = None
+        # Index new files by name once; the first file with a given name wins
+        new_by_name = {}
+        for new_file in new_components[comp]:
+            new_by_name.setdefault(os.path.basename(new_file), new_file)
 
-            for new_file in new_components[comp]:
-                if new_file.split("\\")[-1] == file_name:
-                    match = new_file
-                    break
+        for old_file in old_components[comp]:
+            file_name = os.path.basename(old_file)
+            match = new_by_name.get(file_name)
 
             if not match:
                 detailed[comp].append(f"{file_name}: Missing in NEW configs")
@@ -1,13 +1,30 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+def _walk_component(path):
+    files = []
+    stack = [path]
+    while stack:
+        dirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            dirs.append(entry.path)
+                    else:
+                        files.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(dirs))
+    return files
 
 def scan_configs(root):
     components = {}
-    for comp in os.listdir(root):
-        path = os.path.join(root, comp)
-        if os.path.isdir(path):
-            files = []
-            for r, _, f_list in os.walk(path):
-                for f in f_list:
-                    files.append(os.path.join(r, f))
+    with os.scandir(root) as it:
+        comps = [(entry.name, entry.path) for entry in it if entry.is_dir()]
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        results = ex.map(_walk_component, [path for _, path in comps])
+        for (comp, _), files in zip(comps, results):
             components[comp] = files
     return components
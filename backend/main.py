@@ -3,10 +3,13 @@ FastAPI main application with all endpoints for configuration comparison tool.
 """
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import sys
 import os
-import difflib
 
 # Add backend directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -17,11 +20,62 @@ from models.schemas import (
     FileDiff
 )
 from services.folder_compare import match_file_pairs
-from services.diff_service import compare_files, generate_diff_summary
+from services.diff_service import (
+    build_unified_diff, compare_files, compare_files_async,
+    count_unified_changes, generate_diff_summary
+)
 from services.excel_service import update_excel_file
 from utils.file_utils import path_exists, safe_isdir
 
-app = FastAPI(title="Config Compare Tool API", version="1.0.0")
+# ProcessPoolExecutor rejects more than 61 workers on Windows
+MAX_POOL_WORKERS = 61
+
+# Worker processes for CPU-bound diffing, shared by all requests
+process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared process pool, creating it if it has not been started yet
+    or after a broken pool was discarded.
+    
+    Returns:
+        ProcessPoolExecutor used for diffing file pairs
+    """
+    global process_pool
+    if process_pool is None:
+        process_pool = ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, MAX_POOL_WORKERS)
+        )
+    return process_pool
+
+
+def discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Shut down a broken pool so the next get_process_pool() call starts a new one.
+    Does nothing to the shared pool if it has already been replaced.
+    
+    Args:
+        pool: The pool that raised BrokenProcessPool
+    """
+    global process_pool
+    if process_pool is pool:
+        process_pool = None
+    pool.shutdown(wait=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the diff process pool on startup and shut it down on exit."""
+    global process_pool
+    get_process_pool()
+    yield
+    if process_pool is not None:
+        process_pool.shutdown()
+        process_pool = None
+
+
+app = FastAPI(title="Config Compare Tool API", version="1.0.0", lifespan=lifespan)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -40,7 +94,7 @@ def root():
 
 
 @app.post("/compare", response_model=dict)
-def compare_files_endpoint(request: CompareRequest):
+async def compare_files_endpoint(request: CompareRequest):
     """
     Compare two individual files and return diff.
     
@@ -55,7 +109,7 @@ def compare_files_endpoint(request: CompareRequest):
     if not path_exists(request.new_path):
         raise HTTPException(status_code=404, detail=f"New file not found: {request.new_path}")
     
-    file_diff = compare_files(request.old_path, request.new_path)
+    file_diff = await compare_files_async(request.old_path, request.new_path)
     if file_diff is None:
         raise HTTPException(status_code=500, detail="Error comparing files")
     
@@ -63,11 +117,38 @@ def compare_files_endpoint(request: CompareRequest):
         "file_name": file_diff.file_name,
         "has_changes": file_diff.has_changes,
         "unified_diff": file_diff.unified_diff,
-        "diff_lines": [line.dict() for line in file_diff.diff_lines],
+        "diff_lines": [line._asdict() for line in file_diff.diff_lines],
         "summary": generate_diff_summary(file_diff)
     }
 
 
+@app.get("/file-diff", response_model=FileDiff)
+async def file_diff_endpoint(old: str, new: str, component_name: str = ""):
+    """
+    Compare two files on demand and return the full diff.
+    Used to lazily load the diff of a single file from a folder comparison.
+    
+    Args:
+        old: Path to old file
+        new: Path to new file
+        component_name: Component the files belong to
+        
+    Returns:
+        FileDiff with parsed diff lines and unified diff
+    """
+    if not path_exists(old):
+        raise HTTPException(status_code=404, detail=f"Old file not found: {old}")
+    if not path_exists(new):
+        raise HTTPException(status_code=404, detail=f"New file not found: {new}")
+    
+    file_diff = await compare_files_async(old, new)
+    if file_diff is None:
+        raise HTTPException(status_code=500, detail="Error comparing files")
+    
+    file_diff.component_name = component_name
+    return file_diff
+
+
 @app.post("/scan-folders", response_model=ScanFoldersResponse)
 def scan_folders_endpoint(request: ScanFoldersRequest):
     """
@@ -98,10 +179,64 @@ def scan_folders_endpoint(request: ScanFoldersRequest):
     )
 
 
+# FileDiff fields left out of folder comparison results to keep payloads small
+DIFF_DETAIL_FIELDS = {"line_types", "contents", "old_line_nums", "new_line_nums", "unified_diff"}
+
+
+def _diff_one(pair: Dict) -> Tuple[Dict, Optional[Dict], Optional[str], Optional[str]]:
+    """
+    Compare a single matched file pair.
+    Runs in a worker process, so results are returned as plain data.
+    The files are read here, inside the worker, so their contents never
+    pass through the main process.
+    
+    Args:
+        pair: Matched pair dict from match_file_pairs
+        
+    Returns:
+        Tuple of (pair, file_diff_dict, summary_str, error_or_None)
+    """
+    component_name = pair["component_name"]
+    config_file_name = pair["config_file_name"]
+    old_path = pair["old_path"]
+    new_path = pair["new_path"]
+    
+    # Check if files exist
+    if not path_exists(old_path) or not path_exists(new_path):
+        error_msg = f"Config not found for {component_name}, skipping {config_file_name}"
+        return pair, None, error_msg, error_msg
+    
+    # Compare files
+    file_diff = compare_files(old_path, new_path)
+    if file_diff is None:
+        error_msg = f"Error reading files for {component_name}/{config_file_name}"
+        return pair, None, None, error_msg
+    
+    # Set component name and source paths
+    file_diff.component_name = component_name
+    file_diff.old_path = old_path
+    file_diff.new_path = new_path
+    
+    # Generate summary
+    if file_diff.has_changes:
+        change_summary = generate_diff_summary(file_diff)
+        pair_summary = f"{component_name}/{config_file_name}: {change_summary}"
+    else:
+        pair_summary = f"{component_name}/{config_file_name}: No changes detected"
+    
+    # Only the summary fields are returned; clients fetch line data via /file-diff
+    return pair, file_diff.model_dump(exclude=DIFF_DETAIL_FIELDS), pair_summary, None
+
+
+# Maximum number of file pairs submitted to the process pool at once
+MAX_CONCURRENT_PAIRS = 64
+
+
 @app.post("/compare-folders", response_model=CompareFoldersResponse)
-def compare_folders_endpoint(request: CompareFoldersRequest):
+async def compare_folders_endpoint(request: CompareFoldersRequest):
     """
-    Compare two folders recursively and return diff for each matched file.
+    Compare two folders recursively and return a diff summary for each matched file.
+    Line-level diff data is omitted; use /file-diff to fetch it per file.
     
     Args:
         request: CompareFoldersRequest with old_folder and new_folder
@@ -114,51 +249,47 @@ def compare_folders_endpoint(request: CompareFoldersRequest):
     if not path_exists(request.new_folder) or not safe_isdir(request.new_folder):
         raise HTTPException(status_code=404, detail=f"New folder not found: {request.new_folder}")
     
-    # Get matched file pairs
-    matched_pairs, old_only, new_only = match_file_pairs(request.old_folder, request.new_folder)
+    loop = asyncio.get_running_loop()
+    
+    # Get matched file pairs (scanning is blocking I/O)
+    matched_pairs, old_only, new_only = await loop.run_in_executor(
+        None, match_file_pairs, request.old_folder, request.new_folder
+    )
     
     file_diffs: List[FileDiff] = []
     errors: List[str] = []
     summary: List[str] = []
     
-    # Process each matched pair
-    for pair in matched_pairs:
-        component_name = pair["component_name"]
-        config_file_name = pair["config_file_name"]
-        old_path = pair["old_path"]
-        new_path = pair["new_path"]
-        
-        # Check if files exist
-        if not path_exists(old_path):
-            error_msg = f"Config not found for {component_name}, skipping {config_file_name}"
-            errors.append(error_msg)
-            summary.append(error_msg)
-            continue
-        
-        if not path_exists(new_path):
-            error_msg = f"Config not found for {component_name}, skipping {config_file_name}"
-            errors.append(error_msg)
-            summary.append(error_msg)
-            continue
-        
-        # Compare files
-        file_diff = compare_files(old_path, new_path)
-        if file_diff is None:
-            error_msg = f"Error reading files for {component_name}/{config_file_name}"
-            errors.append(error_msg)
-            continue
+    # Diff each matched pair in a worker process (difflib is CPU-bound).
+    # Workers read the files themselves, so file contents in memory are bounded
+    # by the pool size; the semaphore only caps how many pairs are queued.
+    results = []
+    if matched_pairs:
+        semaphore = asyncio.BoundedSemaphore(MAX_CONCURRENT_PAIRS)
         
-        # Set component name
-        file_diff.component_name = component_name
-        
-        # Generate summary
-        if file_diff.has_changes:
-            change_summary = generate_diff_summary(file_diff)
-            summary.append(f"{component_name}/{config_file_name}: {change_summary}")
-        else:
-            summary.append(f"{component_name}/{config_file_name}: No changes detected")
+        async def diff_pair(pair: Dict):
+            async with semaphore:
+                # A crashed worker breaks the whole pool; rebuild it and retry once
+                for _ in range(2):
+                    executor = get_process_pool()
+                    try:
+                        return await loop.run_in_executor(executor, _diff_one, pair)
+                    except BrokenProcessPool:
+                        discard_process_pool(executor)
+            error_msg = (
+                f"Worker crashed comparing {pair['component_name']}/{pair['config_file_name']}"
+            )
+            return pair, None, None, error_msg
         
-        file_diffs.append(file_diff)
+        results = await asyncio.gather(*[diff_pair(pair) for pair in matched_pairs])
+    
+    for pair, file_diff_dict, pair_summary, error in results:
+        if error is not None:
+            errors.append(error)
+        if pair_summary is not None:
+            summary.append(pair_summary)
+        if file_diff_dict is not None:
+            file_diffs.append(FileDiff(**file_diff_dict))
     
     # Add unmatched components to summary
     for comp in old_only:
@@ -200,34 +331,18 @@ async def compare_files_upload(
     old_text = old_bytes.decode("utf-8", errors="ignore").splitlines(keepends=True)
     new_text = new_bytes.decode("utf-8", errors="ignore").splitlines(keepends=True)
 
-    unified_diff = list(
-        difflib.unified_diff(
-            old_text,
-            new_text,
-            fromfile=old_file.filename or "old_file",
-            tofile=new_file.filename or "new_file",
-            lineterm="",
-        )
-    )
-
-    # Determine if there are actual content changes
-    has_changes = any(
-        line.startswith(("+", "-"))
-        and not line.startswith(("+++", "---"))
-        for line in unified_diff
+    unified_diff = build_unified_diff(
+        old_text,
+        new_text,
+        fromfile=old_file.filename or "old_file",
+        tofile=new_file.filename or "new_file",
     )
 
     # Basic summary (counts of added/removed lines)
-    added = sum(
-        1
-        for line in unified_diff
-        if line.startswith("+") and not line.startswith("+++")
-    )
-    removed = sum(
-        1
-        for line in unified_diff
-        if line.startswith("-") and not line.startswith("---")
-    )
+    added, removed = count_unified_changes(unified_diff)
+
+    # Determine if there are actual content changes
+    has_changes = (added + removed) > 0
 
     if not has_changes:
         summary = "No changes detected"
@@ -275,7 +390,7 @@ def update_excel_endpoint(request: UpdateExcelRequest):
 
 
 @app.post("/compare-and-update")
-def compare_and_update_endpoint(request: dict):
+async def compare_and_update_endpoint(request: dict):
     """
     Combined endpoint: Compare folders and update Excel in one operation.
     This is the main endpoint used by the UI.
@@ -298,7 +413,7 @@ def compare_and_update_endpoint(request: dict):
         old_folder=old_folder,
         new_folder=new_folder
     )
-    compare_result = compare_folders_endpoint(compare_request)
+    compare_result = await compare_folders_endpoint(compare_request)
     
     # Update Excel if path provided
     excel_result = None
@@ -308,7 +423,9 @@ def compare_and_update_endpoint(request: dict):
             file_diffs=compare_result.file_diffs
         )
         try:
-            excel_result = update_excel_endpoint(excel_request)
+            excel_result = await asyncio.get_running_loop().run_in_executor(
+                None, update_excel_endpoint, excel_request
+            )
         except HTTPException as e:
             excel_result = UpdateExcelResponse(
                 success=False,
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for API request/response models.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any
 from pydantic import BaseModel
 
 
@@ -27,13 +27,44 @@ class DiffLine(BaseModel):
     new_line_num: Optional[int] = None
 
 
+class DiffLineRaw(NamedTuple):
+    """Lightweight internal representation of a single diff line."""
+    line_type: str
+    content: str
+    old_line_num: Optional[int] = None
+    new_line_num: Optional[int] = None
+
+
 class FileDiff(BaseModel):
-    """Model for file diff result."""
+    """
+    Model for file diff result.
+    Parsed diff lines are stored column-wise: entry i of each list
+    describes the same line (see DiffLine for the meaning of each column).
+    Summary-only results (from /compare-folders) leave the line data empty.
+    """
     file_name: str
     component_name: str
     has_changes: bool
-    diff_lines: List[DiffLine]
-    unified_diff: List[str]  # Raw unified diff output
+    line_types: List[str] = []
+    contents: List[str] = []
+    old_line_nums: List[Optional[int]] = []
+    new_line_nums: List[Optional[int]] = []
+    unified_diff: List[str] = []  # Raw unified diff output
+    added: Optional[int] = None  # Cached count of added lines
+    removed: Optional[int] = None  # Cached count of removed lines
+    old_path: Optional[str] = None  # Source paths, for fetching the diff via /file-diff
+    new_path: Optional[str] = None
+
+    @property
+    def diff_lines(self) -> List[DiffLineRaw]:
+        """Parsed diff lines as row tuples."""
+        return list(map(
+            DiffLineRaw,
+            self.line_types,
+            self.contents,
+            self.old_line_nums,
+            self.new_line_nums
+        ))
 
 
 class CompareFoldersRequest(BaseModel):
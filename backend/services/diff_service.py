@@ -2,106 +2,377 @@
 Service for generating diffs between files using difflib.
 Produces unified diff format and parsed diff lines for UI display.
 """
+import asyncio
 import os
+import re
 import sys
-import difflib
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional, Sequence, Tuple
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.file_utils import safe_read_file
-from models.schemas import FileDiff, DiffLine
+try:
+    # C-accelerated drop-in replacement for difflib.SequenceMatcher
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
 
+from utils.file_utils import (
+    safe_read_file, safe_file_digest, safe_is_binary, MAX_TEXT_BYTES
+)
+from models.schemas import FileDiff
 
-def parse_unified_diff(unified_diff: List[str]) -> List[DiffLine]:
+
+class DiffColumns(NamedTuple):
+    """Parsed diff lines stored as parallel lists, one entry per line."""
+    line_types: List[str]
+    contents: List[str]
+    old_line_nums: List[Optional[int]]
+    new_line_nums: List[Optional[int]]
+
+
+# unified_diff content for files that are not diffed as text
+SKIPPED_DIFF_MARKER = "<binary or too large: skipped>"
+
+# Line type keyed by the first character of a unified diff line
+_LINE_KINDS = {"-": "removed", "+": "added", " ": "context"}
+
+# Starting line numbers from a hunk header such as "@@ -12,5 +12,6 @@"
+_HUNK_HEADER_RE = re.compile(r"@@ -(\d+)(?:,\d+)? \+(\d+)")
+
+
+def _format_range_unified(start: int, stop: int) -> str:
+    """
+    Convert a range to the "ed" format used in unified diff hunk headers.
+    
+    Args:
+        start: Zero-based start index
+        stop: Zero-based stop index (exclusive)
+        
+    Returns:
+        Range string such as "4", "4,3" or "3,0"
+    """
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _get_grouped_opcodes(
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    n: int = 3
+) -> List[List[tuple]]:
+    """
+    Group diff opcodes into hunks with n lines of context.
+    Identical leading and trailing lines are stripped before running the
+    matcher (as GNU diff does), so only the changed middle region is diffed.
+    
+    Args:
+        old_lines: Lines of the old file
+        new_lines: Lines of the new file
+        n: Number of context lines
+        
+    Returns:
+        List of hunks, each a list of (tag, i1, i2, j1, j2) opcodes
+    """
+    old_len = len(old_lines)
+    new_len = len(new_lines)
+    
+    # Length of the common prefix
+    prefix = 0
+    limit = min(old_len, new_len)
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    
+    # Length of the common suffix (not overlapping the prefix)
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old_lines[old_len - suffix - 1] == new_lines[new_len - suffix - 1]:
+        suffix += 1
+    
+    codes = []
+    if prefix:
+        codes.append(("equal", 0, prefix, 0, prefix))
+    
+    old_mid = old_lines[prefix:old_len - suffix]
+    new_mid = new_lines[prefix:new_len - suffix]
+    if old_mid or new_mid:
+        matcher = SequenceMatcher(None, old_mid, new_mid)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            codes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    
+    if suffix:
+        codes.append(("equal", old_len - suffix, old_len, new_len - suffix, new_len))
+    
+    # Same grouping as difflib.SequenceMatcher.get_grouped_opcodes()
+    if not codes:
+        codes = [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    
+    groups = []
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        # Start a new hunk whenever there is a large unchanged range
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    
+    return groups
+
+
+def build_unified_diff(
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    fromfile: str = "",
+    tofile: str = "",
+    n: int = 3
+) -> List[str]:
+    """
+    Generate a unified diff between two lists of lines.
+    Output has the same format as difflib.unified_diff(..., lineterm="").
+    
+    Args:
+        old_lines: Lines of the old file
+        new_lines: Lines of the new file
+        fromfile: Name of the old file for the header
+        tofile: Name of the new file for the header
+        n: Number of context lines
+        
+    Returns:
+        List of unified diff lines
+    """
+    unified_diff = []
+    
+    for group in _get_grouped_opcodes(old_lines, new_lines, n):
+        if not unified_diff:
+            unified_diff.append(f"--- {fromfile}")
+            unified_diff.append(f"+++ {tofile}")
+        
+        first, last = group[0], group[-1]
+        old_range = _format_range_unified(first[1], last[2])
+        new_range = _format_range_unified(first[3], last[4])
+        unified_diff.append(f"@@ -{old_range} +{new_range} @@")
+        
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                unified_diff.extend(" " + line for line in old_lines[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                unified_diff.extend("-" + line for line in old_lines[i1:i2])
+            if tag in ("replace", "insert"):
+                unified_diff.extend("+" + line for line in new_lines[j1:j2])
+    
+    return unified_diff
+
+
+def parse_unified_diff(unified_diff: List[str]) -> Tuple[DiffColumns, int, int]:
     """
-    Parse unified diff output into structured DiffLine objects.
+    Parse unified diff output into column-wise diff line data.
+    Dispatches on the first character of each line in a single pass.
+    Added and removed lines are counted in the same pass.
     
     Args:
         unified_diff: List of unified diff lines
         
     Returns:
-        List of DiffLine objects
+        Tuple of (columns, added_count, removed_count)
     """
-    diff_lines = []
+    columns = DiffColumns([], [], [], [])
+    add_type = columns.line_types.append
+    add_content = columns.contents.append
+    add_old_num = columns.old_line_nums.append
+    add_new_num = columns.new_line_nums.append
+    added = 0
+    removed = 0
     old_line_num = None
     new_line_num = None
     
     for line in unified_diff:
-        if line.startswith("---") or line.startswith("+++"):
-            # Header lines
-            diff_lines.append(DiffLine(
-                line_type="header",
-                content=line,
-                old_line_num=None,
-                new_line_num=None
-            ))
-        elif line.startswith("@@"):
-            # Hunk header - extract line numbers
-            diff_lines.append(DiffLine(
-                line_type="header",
-                content=line,
-                old_line_num=None,
-                new_line_num=None
-            ))
-            # Parse line numbers from hunk header
-            try:
-                parts = line.split("@@")[1].strip().split()
-                if len(parts) >= 2:
-                    old_part = parts[0].lstrip("-")
-                    new_part = parts[1].lstrip("+")
-                    if "," in old_part:
-                        old_line_num = int(old_part.split(",")[0])
-                    else:
-                        old_line_num = int(old_part) if old_part else None
-                    if "," in new_part:
-                        new_line_num = int(new_part.split(",")[0])
-                    else:
-                        new_line_num = int(new_part) if new_part else None
-            except (ValueError, IndexError):
-                pass
-        elif line.startswith("-"):
+        kind = _LINE_KINDS.get(line[:1])
+        
+        if kind == "removed" and not line.startswith("---"):
             # Removed line
-            diff_lines.append(DiffLine(
-                line_type="removed",
-                content=line[1:] if len(line) > 1 else "",
-                old_line_num=old_line_num,
-                new_line_num=None
-            ))
+            line_type, content, old_num, new_num = "removed", line[1:], old_line_num, None
+            removed += 1
             if old_line_num is not None:
                 old_line_num += 1
-        elif line.startswith("+"):
+        elif kind == "added" and not line.startswith("+++"):
             # Added line
-            diff_lines.append(DiffLine(
-                line_type="added",
-                content=line[1:] if len(line) > 1 else "",
-                old_line_num=None,
-                new_line_num=new_line_num
-            ))
+            line_type, content, old_num, new_num = "added", line[1:], None, new_line_num
+            added += 1
             if new_line_num is not None:
                 new_line_num += 1
-        elif line.startswith(" "):
+        elif kind == "context":
             # Context line (unchanged)
-            diff_lines.append(DiffLine(
-                line_type="context",
-                content=line[1:] if len(line) > 1 else "",
-                old_line_num=old_line_num,
-                new_line_num=new_line_num
-            ))
+            line_type, content, old_num, new_num = "context", line[1:], old_line_num, new_line_num
             if old_line_num is not None:
                 old_line_num += 1
             if new_line_num is not None:
                 new_line_num += 1
+        elif kind is not None or line.startswith("@@"):
+            # File headers (---/+++) and hunk headers
+            line_type, content, old_num, new_num = "header", line, None, None
+            # Hunk header - extract starting line numbers
+            match = _HUNK_HEADER_RE.match(line)
+            if match:
+                old_line_num = int(match.group(1))
+                new_line_num = int(match.group(2))
         else:
             # Other lines (empty, etc.)
-            diff_lines.append(DiffLine(
-                line_type="context",
-                content=line,
-                old_line_num=None,
-                new_line_num=None
-            ))
+            line_type, content, old_num, new_num = "context", line, None, None
+        
+        add_type(line_type)
+        add_content(content)
+        add_old_num(old_num)
+        add_new_num(new_num)
+    
+    return columns, added, removed
+
+
+def _files_identical(old_path: str, new_path: str) -> bool:
+    """
+    Check whether two files have identical bytes.
+    Only hashes the files when their sizes match.
+    
+    Args:
+        old_path: Path to old file
+        new_path: Path to new file
+        
+    Returns:
+        True if both files are readable and byte-identical
+    """
+    try:
+        if os.path.getsize(old_path) != os.path.getsize(new_path):
+            return False
+    except OSError:
+        return False
+    
+    old_digest = safe_file_digest(old_path)
+    return old_digest is not None and old_digest == safe_file_digest(new_path)
+
+
+def _unchanged_file_diff(file_name: str) -> FileDiff:
+    """Build the FileDiff for a pair of identical files."""
+    return FileDiff(
+        file_name=file_name,
+        component_name="",  # Will be set by caller
+        has_changes=False,
+        line_types=[],
+        contents=[],
+        old_line_nums=[],
+        new_line_nums=[],
+        unified_diff=[],
+        added=0,
+        removed=0
+    )
+
+
+def _skipped_file_diff(file_name: str) -> FileDiff:
+    """Build the FileDiff for a changed pair that is not diffed as text."""
+    return FileDiff(
+        file_name=file_name,
+        component_name="",  # Will be set by caller
+        has_changes=True,
+        unified_diff=[SKIPPED_DIFF_MARKER],
+        added=0,
+        removed=0
+    )
+
+
+def _skip_text_diff(old_path: str, new_path: str) -> bool:
+    """
+    Check whether a pair of files should not be diffed as text.
+    
+    Args:
+        old_path: Path to old file
+        new_path: Path to new file
+        
+    Returns:
+        True if either file is larger than MAX_TEXT_BYTES or looks binary
+    """
+    try:
+        if os.path.getsize(old_path) > MAX_TEXT_BYTES or os.path.getsize(new_path) > MAX_TEXT_BYTES:
+            return True
+    except OSError:
+        # Let the regular read path report unreadable files
+        return False
+    
+    return safe_is_binary(old_path) or safe_is_binary(new_path)
+
+
+def _skipped_pair_diff(old_path: str, new_path: str) -> Optional[FileDiff]:
+    """
+    Build the FileDiff for a pair that is only compared by content hash.
+    
+    Args:
+        old_path: Path to old file
+        new_path: Path to new file
+        
+    Returns:
+        FileDiff object or None if either file cannot be read
+    """
+    old_digest = safe_file_digest(old_path)
+    new_digest = safe_file_digest(new_path)
+    
+    if old_digest is None or new_digest is None:
+        return None
+    if old_digest == new_digest:
+        return _unchanged_file_diff(os.path.basename(old_path))
+    
+    return _skipped_file_diff(os.path.basename(old_path))
+
+
+def compare_lines(
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    old_name: str,
+    new_name: str
+) -> FileDiff:
+    """
+    Compare two lists of lines and generate diff.
+    
+    Args:
+        old_lines: Lines of the old file
+        new_lines: Lines of the new file
+        old_name: File name of the old file
+        new_name: File name of the new file
+        
+    Returns:
+        FileDiff object
+    """
+    # Generate unified diff
+    unified_diff = build_unified_diff(
+        old_lines,
+        new_lines,
+        fromfile=old_name,
+        tofile=new_name
+    )
     
-    return diff_lines
+    # Parse diff lines and count actual changes (not just headers)
+    columns, added, removed = parse_unified_diff(unified_diff)
+    
+    return FileDiff(
+        file_name=old_name,
+        component_name="",  # Will be set by caller
+        has_changes=(added + removed) > 0,
+        **columns._asdict(),
+        unified_diff=unified_diff,
+        added=added,
+        removed=removed
+    )
 
 
 def compare_files(old_path: str, new_path: str) -> Optional[FileDiff]:
@@ -115,6 +386,14 @@ def compare_files(old_path: str, new_path: str) -> Optional[FileDiff]:
     Returns:
         FileDiff object or None if error
     """
+    # Byte-identical files have no changes; skip reading lines and diffing
+    if _files_identical(old_path, new_path):
+        return _unchanged_file_diff(os.path.basename(old_path))
+    
+    # Binary or very large files are only compared by content hash
+    if _skip_text_diff(old_path, new_path):
+        return _skipped_pair_diff(old_path, new_path)
+    
     old_lines = safe_read_file(old_path)
     new_lines = safe_read_file(new_path)
     
@@ -123,31 +402,91 @@ def compare_files(old_path: str, new_path: str) -> Optional[FileDiff]:
     if new_lines is None:
         return None
     
-    # Generate unified diff
-    unified_diff = list(difflib.unified_diff(
+    return compare_lines(
         old_lines,
         new_lines,
-        fromfile=os.path.basename(old_path),
-        tofile=os.path.basename(new_path),
-        lineterm=""
-    ))
+        os.path.basename(old_path),
+        os.path.basename(new_path)
+    )
+
+
+async def compare_files_async(old_path: str, new_path: str) -> Optional[FileDiff]:
+    """
+    Compare two files without blocking the event loop.
+    Both files are read concurrently in worker threads.
     
-    # Check if there are actual changes (not just headers)
-    has_changes = len([line for line in unified_diff 
-                      if line.startswith(("+", "-")) and not line.startswith(("+++", "---"))]) > 0
+    Args:
+        old_path: Path to old file
+        new_path: Path to new file
+        
+    Returns:
+        FileDiff object or None if error
+    """
+    loop = asyncio.get_running_loop()
     
-    # Parse diff lines
-    diff_lines = parse_unified_diff(unified_diff)
+    if await loop.run_in_executor(None, _files_identical, old_path, new_path):
+        return _unchanged_file_diff(os.path.basename(old_path))
     
-    return FileDiff(
-        file_name=os.path.basename(old_path),
-        component_name="",  # Will be set by caller
-        has_changes=has_changes,
-        diff_lines=diff_lines,
-        unified_diff=unified_diff
+    if await loop.run_in_executor(None, _skip_text_diff, old_path, new_path):
+        return await loop.run_in_executor(None, _skipped_pair_diff, old_path, new_path)
+    
+    old_lines, new_lines = await asyncio.gather(
+        loop.run_in_executor(None, safe_read_file, old_path),
+        loop.run_in_executor(None, safe_read_file, new_path)
+    )
+    
+    if old_lines is None:
+        return None
+    if new_lines is None:
+        return None
+    
+    return await loop.run_in_executor(
+        None,
+        compare_lines,
+        old_lines,
+        new_lines,
+        os.path.basename(old_path),
+        os.path.basename(new_path)
     )
 
 
+def count_unified_changes(unified_diff: List[str]) -> Tuple[int, int]:
+    """
+    Count added and removed lines in raw unified diff output.
+    Counts line prefixes with str.count on the joined text so the scan
+    runs in C rather than as a Python loop over lines.
+    
+    Args:
+        unified_diff: List of unified diff lines
+        
+    Returns:
+        Tuple of (added, removed)
+    """
+    # Every line starts right after a "\n", including the first one
+    text = "\n" + "\n".join(unified_diff)
+    added = text.count("\n+") - text.count("\n+++")
+    removed = text.count("\n-") - text.count("\n---")
+    return added, removed
+
+
+def count_changes(file_diff: FileDiff) -> Tuple[int, int]:
+    """
+    Get the number of added and removed lines in a diff.
+    Uses the counts cached on the FileDiff when available.
+    
+    Args:
+        file_diff: FileDiff object
+        
+    Returns:
+        Tuple of (added, removed)
+    """
+    if file_diff.added is not None and file_diff.removed is not None:
+        return file_diff.added, file_diff.removed
+    
+    line_types = file_diff.line_types
+    return line_types.count("added"), line_types.count("removed")
+
+
 def generate_diff_summary(file_diff: FileDiff) -> str:
     """
     Generate a human-readable summary of changes.
@@ -161,8 +500,7 @@ def generate_diff_summary(file_diff: FileDiff) -> str:
     if not file_diff.has_changes:
         return "No changes detected"
     
-    added = sum(1 for line in file_diff.diff_lines if line.line_type == "added")
-    removed = sum(1 for line in file_diff.diff_lines if line.line_type == "removed")
+    added, removed = count_changes(file_diff)
     
     parts = []
     if added > 0:
@@ -13,8 +13,12 @@ from openpyxl import load_workbook, Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 from models.schemas import FileDiff
+from services.diff_service import generate_diff_summary
 from utils.file_utils import path_exists
 
+# Column headers of the comparison sheet
+EXCEL_HEADERS = ["Component Name", "Config File Name", "Changes", "Date of Comparison"]
+
 
 def check_excel_open(excel_path: str) -> bool:
     """
@@ -71,14 +75,18 @@ def update_excel_file(
             if "Sheet" in workbook.sheetnames:
                 workbook.remove(workbook["Sheet"])
         
+        # Longest value seen per column, for auto-sizing widths
+        max_lengths = [0] * len(EXCEL_HEADERS)
+        
         # Get or create the target sheet
         if sheet_name in workbook.sheetnames:
             sheet = workbook[sheet_name]
         else:
             sheet = workbook.create_sheet(sheet_name)
             # Add headers if new sheet
-            headers = ["Component Name", "Config File Name", "Changes", "Date of Comparison"]
+            headers = EXCEL_HEADERS
             sheet.append(headers)
+            max_lengths = [len(header) for header in headers]
             # Style headers
             header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
             header_font = Font(bold=True, color="FFFFFF")
@@ -92,7 +100,7 @@ def update_excel_file(
         start_row = max_row + 1
         
         # Prepare data rows
-        updated_rows = 0
+        rows = []
         comparison_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         for file_diff in file_diffs:
@@ -100,39 +108,32 @@ def update_excel_file(
                 continue
             
             # Generate change summary
-            added = sum(1 for line in file_diff.diff_lines if line.line_type == "added")
-            removed = sum(1 for line in file_diff.diff_lines if line.line_type == "removed")
+            change_summary = generate_diff_summary(file_diff)
             
-            change_summary = "No changes detected"
-            if added > 0 or removed > 0:
-                parts = []
-                if added > 0:
-                    parts.append(f"{added} line(s) added")
-                if removed > 0:
-                    parts.append(f"{removed} line(s) removed")
-                change_summary = "; ".join(parts)
-            
-            # Add row
+            # Collect row and track column widths while building it
             row_data = [
                 file_diff.component_name,
                 file_diff.file_name,
                 change_summary,
                 comparison_date
             ]
+            rows.append(row_data)
+            for index, value in enumerate(row_data):
+                max_lengths[index] = max(max_lengths[index], len(value))
+        
+        # Add rows in one tight loop
+        for row_data in rows:
             sheet.append(row_data)
-            updated_rows += 1
+        updated_rows = len(rows)
         
-        # Auto-adjust column widths
-        for column in sheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
+        # Auto-adjust column widths from the tracked lengths instead of
+        # rescanning every cell; existing widths are kept as a minimum
+        for index, max_length in enumerate(max_lengths):
+            column_letter = get_column_letter(index + 1)
             adjusted_width = min(max_length + 2, 50)
+            if column_letter in sheet.column_dimensions:
+                current_width = sheet.column_dimensions[column_letter].width or 0
+                adjusted_width = max(adjusted_width, min(current_width, 50))
             sheet.column_dimensions[column_letter].width = adjusted_width
         
         # Save workbook
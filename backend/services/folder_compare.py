@@ -4,20 +4,42 @@ Matches components by subfolder name and config files by filename.
 """
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.file_utils import (
-    safe_listdir, safe_isdir, get_filename, 
-    normalize_path, path_exists
+    safe_scandir, safe_isdir, safe_isdir_from_stat, safe_walk, get_filename, 
+    normalize_path, fast_normalize_path
 )
 
+# Maximum number of component directories scanned concurrently
+SCAN_MAX_WORKERS = 32
+
+
+def _walk_component(comp_path: str) -> List[str]:
+    """
+    Recursively collect config files under a component directory.
+    Uses safe_walk, so file types come from the directory listing itself
+    and entries are visited in the same order as os.walk.
+    
+    Args:
+        comp_path: Component directory path
+        
+    Returns:
+        List of normalized config file paths
+    """
+    # Resolve the root once; paths joined below it only need separator fixes
+    root = normalize_path(comp_path)
+    return [fast_normalize_path(entry.path) for entry in safe_walk(root)]
+
 
 def scan_configs(root: str) -> Dict[str, List[str]]:
     """
     Recursively scan folder structure to find components and their config files.
-    Components are identified by subfolder names.
+    Components are identified by subfolder names and walked concurrently.
+    The tree is rescanned on every call, so nested changes are always seen.
     
     Args:
         root: Root folder path
@@ -27,33 +49,29 @@ def scan_configs(root: str) -> Dict[str, List[str]]:
     """
     components = {}
     
-    if not path_exists(root) or not safe_isdir(root):
+    # One stat answers both "exists" and "is a directory"
+    try:
+        root_stat = os.stat(root)
+    except (PermissionError, IOError, OSError, ValueError):
+        root_stat = None
+    if not safe_isdir_from_stat(root_stat):
         return components
     
     try:
-        entries = safe_listdir(root)
+        entries = safe_scandir(root)
+        
+        # Only process directories (components); DirEntry answers without a stat
+        comp_entries = [entry for entry in entries if safe_isdir(entry)]
+        comp_names = [entry.name for entry in comp_entries]
+        comp_paths = [entry.path for entry in comp_entries]
         
-        for entry in entries:
-            comp_path = os.path.join(root, entry)
+        # scandir/stat release the GIL, so threads overlap the I/O latency
+        with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+            results = executor.map(_walk_component, comp_paths)
             
-            # Only process directories (components)
-            if safe_isdir(comp_path):
-                files = []
-                
-                # Recursively walk through component directory
-                try:
-                    for root_dir, dirs, file_list in os.walk(comp_path):
-                        for file_name in file_list:
-                            file_path = os.path.join(root_dir, file_name)
-                            # Only include files (skip directories)
-                            if os.path.isfile(file_path):
-                                files.append(normalize_path(file_path))
-                except (PermissionError, IOError, OSError) as e:
-                    print(f"Error scanning {comp_path}: {e}")
-                    continue
-                
+            for comp_name, files in zip(comp_names, results):
                 if files:
-                    components[entry] = files
+                    components[comp_name] = files
                     
     except (PermissionError, IOError, OSError) as e:
         print(f"Error scanning root {root}: {e}")
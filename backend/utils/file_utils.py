@@ -2,92 +2,372 @@
 File utilities for safe file operations with error handling.
 Handles Windows paths, permission errors, and encoding issues.
 """
+import io
+import logging
+import mmap
 import os
+import hashlib
+import stat
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple, Union
 
+try:
+    # Optional SIMD-accelerated hash; falls back to SHA-256 when not installed
+    from blake3 import blake3 as _content_hash
+except ImportError:
+    _content_hash = hashlib.sha256
 
-def safe_read_file(file_path: str) -> Optional[List[str]]:
+logger = logging.getLogger(__name__)
+
+# Files larger than this are memory-mapped instead of read through a buffer
+MMAP_THRESHOLD = 256 * 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    """
+    Read an integer setting from the environment.
+    
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or malformed
+        
+    Returns:
+        Parsed integer value
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r, using %d", name, value, default)
+        return default
+
+
+# Files larger than this are not diffed as text
+MAX_TEXT_BYTES = _env_int("CONFIG_COMPARE_MAX_TEXT_BYTES", 10 * 1024 * 1024)
+
+# Number of leading bytes inspected when sniffing for binary content
+BINARY_SNIFF_BYTES = 4096
+
+# Lines shorter than this are deduplicated within a file to save memory
+SHARED_LINE_MAX_LENGTH = 64
+
+# Errors the safe_* helpers treat as "could not access the path"
+_SAFE_OS_ERRORS = (PermissionError, IOError, OSError)
+# Reads and path checks can also hit ValueError (NUL in path, empty mmap)
+_SAFE_READ_ERRORS = _SAFE_OS_ERRORS + (ValueError,)
+
+# Pre-bound for the hot path checks
+_isdir = os.path.isdir
+_access = os.access
+_normpath = os.path.normpath
+_scandir = os.scandir
+_SEP = os.sep
+_ALTSEP = os.altsep
+
+
+if hasattr(os, "posix_fadvise"):
+    def _advise_sequential(fd: int) -> None:
+        """Tell the kernel a file will be read start to end, so it reads ahead."""
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+else:
+    def _advise_sequential(fd: int) -> None:
+        """No-op where posix_fadvise is unavailable (Windows, macOS)."""
+
+
+def safe_read_file(file_path: str) -> Optional[Tuple[str, ...]]:
     """
     Safely read a file and return lines.
-    Returns None if file cannot be read.
+    Large files are memory-mapped and decoded straight from the page cache.
+    Returns None if file cannot be read or looks binary, so binary files
+    are never decoded in full.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Tuple of lines or None if error
+    """
+    try:
+        with open(file_path, "rb") as f:
+            if looks_binary(f.read(BINARY_SNIFF_BYTES)):
+                logger.debug("Skipping binary file %s", file_path)
+                return None
+            f.seek(0)
+            _advise_sequential(f.fileno())
+            
+            # Size the already-open file rather than stat-ing the path again
+            if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return decode_lines(mapped)
+            return _share_short_lines(
+                io.TextIOWrapper(f, encoding="utf-8", errors="ignore").readlines()
+            )
+    except _SAFE_READ_ERRORS as e:
+        logger.debug("Error reading %s: %s", file_path, e)
+        return None
+
+
+def decode_lines(data: Union[bytes, mmap.mmap]) -> Tuple[str, ...]:
+    """
+    Decode raw file bytes into lines.
+    Matches reading the file in text mode: UTF-8 with undecodable bytes
+    dropped and universal newlines translated to "\n".
+    
+    Args:
+        data: Raw file contents (any bytes-like object)
+        
+    Returns:
+        Tuple of lines
+    """
+    text = str(data, "utf-8", "ignore")
+    # Translate newlines up front; StringIO splits plain "\n" text faster
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return _share_short_lines(io.StringIO(text, newline="\n").readlines())
+
+
+def _share_short_lines(lines: List[str]) -> Tuple[str, ...]:
+    """
+    Make repeated short lines (blank lines, braces, imports) within one file
+    share one str object, to reduce memory. Only deduplicates within the
+    given lines; the old and new sides of a diff do not share objects.
+    Uses a per-call table rather than sys.intern, whose strings are never
+    freed on newer Pythons, so a long-running server does not grow without bound.
+    
+    Args:
+        lines: Lines of a file
+        
+    Returns:
+        The same lines with short duplicates deduplicated
+    """
+    seen = {}
+    share = seen.setdefault
+    return tuple([share(line, line) if len(line) < SHARED_LINE_MAX_LENGTH else line for line in lines])
+
+
+def looks_binary(data: bytes) -> bool:
+    """
+    Check whether file contents look binary (a NUL byte near the start).
+    
+    Args:
+        data: Raw file contents or their first bytes
+        
+    Returns:
+        True if the data appears to be binary
+    """
+    return b"\x00" in data[:BINARY_SNIFF_BYTES]
+
+
+def safe_is_binary(file_path: str) -> bool:
+    """
+    Safely check whether a file looks binary by sniffing its first bytes.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        True if the file appears to be binary, False otherwise or if error
+    """
+    try:
+        with open(file_path, "rb") as f:
+            return looks_binary(f.read(BINARY_SNIFF_BYTES))
+    except _SAFE_OS_ERRORS:
+        return False
+
+
+def safe_file_digest(file_path: str, chunk_size: int = 1 << 20) -> Optional[bytes]:
+    """
+    Safely compute a digest of a file's raw bytes (BLAKE3 when installed,
+    otherwise SHA-256).
+    Reads the file in chunks so large files are not loaded into memory.
     
     Args:
         file_path: Path to the file
+        chunk_size: Number of bytes to read per chunk
         
     Returns:
-        List of lines or None if error
+        Digest bytes or None if error
     """
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.readlines()
-    except (PermissionError, IOError, OSError) as e:
-        print(f"Error reading {file_path}: {e}")
+        digest = _content_hash()
+        with open(file_path, "rb") as f:
+            _advise_sequential(f.fileno())
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.digest()
+    except _SAFE_OS_ERRORS:
         return None
 
 
-def safe_listdir(path: str) -> List[str]:
+def safe_listdir(path: str) -> Tuple[str, ...]:
     """
-    Safely list directory contents, skipping unreadable items.
+    Safely list directory contents.
+    Uses os.scandir, which only yields entries the directory actually
+    holds, so no per-entry existence check (stat) is needed.
     
     Args:
         path: Directory path
         
     Returns:
-        List of directory entries
+        Tuple of directory entry names
     """
     try:
-        return [item for item in os.listdir(path) 
-                if os.path.exists(os.path.join(path, item))]
-    except (PermissionError, IOError, OSError):
+        with os.scandir(path) as it:
+            return tuple([entry.name for entry in it])
+    except _SAFE_OS_ERRORS:
+        return ()
+
+
+def safe_scandir(path: str) -> List[os.DirEntry]:
+    """
+    Safely list directory contents as DirEntry objects.
+    DirEntry caches the file type reported by the directory listing, so
+    callers can check is_dir()/is_file() without another stat call.
+    
+    Args:
+        path: Directory path
+        
+    Returns:
+        List of DirEntry objects
+    """
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except _SAFE_OS_ERRORS:
         return []
 
 
-def safe_isdir(path: str) -> bool:
+def safe_walk(top: str) -> Iterator[os.DirEntry]:
+    """
+    Safely walk a directory tree with os.scandir.
+    Visits directories in the same order as os.walk and, like os.walk, does
+    not descend into symlinked directories. Unreadable directories are skipped;
+    if a listing fails partway, the entries read before the failure are kept.
+    
+    Args:
+        top: Directory to walk
+        
+    Yields:
+        DirEntry for each file (entry.path is already joined to its parent)
+    """
+    stack = [top]
+    
+    while stack:
+        subdirs = []
+        try:
+            with _scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except _SAFE_OS_ERRORS:
+            # Keep the subdirectories listed before the error
+            pass
+        
+        # Push in reverse so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+
+def safe_isdir(path: Union[str, os.DirEntry]) -> bool:
     """
     Safely check if path is a directory.
+    A DirEntry answers from the file type its directory listing reported.
     
     Args:
-        path: Path to check
+        path: Path to check, or a DirEntry from safe_scandir
         
     Returns:
         True if directory, False otherwise
     """
     try:
-        return os.path.isdir(path)
-    except (PermissionError, IOError, OSError):
+        if isinstance(path, os.DirEntry):
+            return path.is_dir()
+        return _isdir(path)
+    except _SAFE_OS_ERRORS:
         return False
 
 
-def get_filename(file_path: str) -> str:
+def safe_isdir_from_stat(st: Optional[os.stat_result]) -> bool:
     """
-    Extract filename from full path.
+    Check whether a stat result describes a directory, without a syscall.
+    Use when the caller has already stat-ed the path.
     
     Args:
-        file_path: Full file path
+        st: Result of os.stat/DirEntry.stat, or None if the stat failed
         
     Returns:
-        Filename only
+        True if directory, False otherwise
     """
-    return os.path.basename(file_path)
+    return st is not None and stat.S_ISDIR(st.st_mode)
+
+
+if _ALTSEP:
+    def get_filename(file_path: str) -> str:
+        """
+        Extract filename from full path.
+        Splits on both Windows separators with two C-level scans instead of
+        going through os.path.basename's splitdrive/split call chain.
+        
+        Args:
+            file_path: Full file path
+            
+        Returns:
+            Filename only
+        """
+        return file_path[max(file_path.rfind(_SEP), file_path.rfind(_ALTSEP)) + 1:]
+else:
+    def get_filename(file_path: str) -> str:
+        """
+        Extract filename from full path.
+        
+        Args:
+            file_path: Full file path
+            
+        Returns:
+            Filename only
+        """
+        return file_path.rpartition(_SEP)[2]
+
+
+# Normalize Windows path separators. Never raises, so it is a direct alias.
+normalize_path = _normpath
+
+# Maps the alternate separator ("/" on Windows) to os.sep; identity on POSIX
+_SEP_TABLE = str.maketrans(os.altsep or os.sep, os.sep)
 
 
-def normalize_path(path: str) -> str:
+def fast_normalize_path(path: str) -> str:
     """
-    Normalize Windows path separators.
+    Canonicalize path separators only, without resolving "." or "..".
+    Use for paths built from an already-normalized root, where this gives
+    the same result as normalize_path.
     
     Args:
         path: Path string
         
     Returns:
-        Normalized path
+        Path with separators converted to os.sep
     """
-    return os.path.normpath(path)
+    return path.translate(_SEP_TABLE)
 
 
 def path_exists(path: str) -> bool:
     """
     Safely check if path exists.
+    Uses os.access(F_OK), which only asks whether the path resolves instead
+    of fetching its metadata. Like os.path.exists, a broken symlink counts
+    as missing.
     
     Args:
         path: Path to check
@@ -96,6 +376,6 @@ def path_exists(path: str) -> bool:
         True if exists, False otherwise
     """
     try:
-        return os.path.exists(path)
-    except (PermissionError, IOError, OSError):
+        return _access(path, os.F_OK)
+    except _SAFE_READ_ERRORS:
         return False